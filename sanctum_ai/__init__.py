@@ -1,6 +1,9 @@
 """SanctumAI Python SDK — secure credential management for AI agents."""
 
+from typing import Any
+
 from sanctum_ai.client import SanctumClient
+from sanctum_ai.pool import SanctumConnectionPool
 from sanctum_ai.exceptions import (
     VaultError,
     AuthError,
@@ -14,8 +17,20 @@ from sanctum_ai.exceptions import (
 
 __version__ = "0.4.0"
 
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use so sync-only users don't pay for asyncio.
+    if name == "AsyncSanctumClient":
+        from sanctum_ai.aio import AsyncSanctumClient
+
+        return AsyncSanctumClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "SanctumClient",
+    "AsyncSanctumClient",
+    "SanctumConnectionPool",
     "VaultError",
     "AuthError",
     "AccessDenied",
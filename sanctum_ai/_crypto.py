@@ -0,0 +1,36 @@
+"""Ed25519 signing backend.
+
+Uses ``cryptography`` (OpenSSL) when installed and PyNaCl otherwise. Both
+produce identical RFC 8032 signatures for the same seed.
+"""
+
+from typing import Callable
+
+from nacl.signing import SigningKey as _NaclSigningKey
+
+try:
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+except ImportError:
+    Ed25519PrivateKey = None  # type: ignore[assignment,misc]
+
+
+class Ed25519Signer:
+    """An Ed25519 private key built from a 32-byte seed.
+
+    The backend key object is constructed once, so repeated :meth:`sign`
+    calls reuse its expanded key material.
+    """
+
+    __slots__ = ("_sign",)
+
+    def __init__(self, seed: bytes):
+        self._sign: Callable[[bytes], bytes]
+        if Ed25519PrivateKey is not None:
+            self._sign = Ed25519PrivateKey.from_private_bytes(bytes(seed)).sign
+        else:
+            key = _NaclSigningKey(bytes(seed))
+            self._sign = lambda data: key.sign(data).signature
+
+    def sign(self, data: bytes) -> bytes:
+        """Return the 64-byte detached signature of *data*."""
+        return self._sign(data)
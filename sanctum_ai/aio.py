@@ -0,0 +1,308 @@
+"""AsyncSanctumClient — asyncio client that multiplexes RPCs on one connection."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sanctum_ai.client import SanctumClient, _decode_value, _sign_challenge
+from sanctum_ai.connection import UnixConnection, resolve_connection
+from sanctum_ai.exceptions import AuthError, VaultError
+from sanctum_ai.protocol import (
+    _U32,
+    MAX_MESSAGE_SIZE,
+    _check_length,
+    _loads,
+    encode_request,
+    frame_payload,
+    raise_on_error,
+)
+
+
+async def recv_stream(
+    reader: asyncio.StreamReader, max_size: int = MAX_MESSAGE_SIZE
+) -> dict:
+    """Read a length-prefixed JSON-RPC message from an asyncio stream."""
+    length = _U32.unpack(await reader.readexactly(4))[0]
+    _check_length(length, max_size)
+    return _loads(await reader.readexactly(length))
+
+
+class AsyncSanctumClient:
+    """Asyncio client for the Sanctum credential vault.
+
+    Requests from concurrent tasks are written to a single connection
+    without waiting for earlier responses; a background reader task
+    resolves each caller's future by response ``id``, so many retrievals
+    cost roughly one round-trip in total.
+
+    Usage::
+
+        async with AsyncSanctumClient("my-agent") as client:
+            a, b = await asyncio.gather(
+                client.retrieve("openai/api_key"),
+                client.retrieve("github/token"),
+            )
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        *,
+        socket_path: Optional[str] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        key_path: Optional[str] = None,
+        passphrase: Optional[str] = None,
+        prefer_unix_socket: bool = True,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        peer_auth: bool = False,
+    ):
+        self.agent_name = agent_name
+        self.connection = resolve_connection(
+            socket_path,
+            host,
+            port,
+            SanctumClient.DEFAULT_SOCKET,
+            prefer_unix_socket=prefer_unix_socket,
+        )
+        self._max_message_size = max_message_size
+        self._peer_auth = peer_auth
+        # Key loading (and its caching) is shared with the sync client.
+        self._keys = SanctumClient(agent_name, key_path=key_path, passphrase=passphrase)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional["asyncio.Task[None]"] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, "asyncio.Future[dict]"] = {}
+        # Set once the reader task stops; no further responses will arrive.
+        self._read_error: Optional[VaultError] = None
+        self._session_id: Optional[str] = None
+        self._req_id = 0
+        # Insertion-ordered set of held lease ids (values unused).
+        self._leases: Dict[str, None] = {}
+        self._capabilities: frozenset = frozenset()
+
+    # -- lifecycle ----------------------------------------------------------
+
+    async def connect(self) -> "AsyncSanctumClient":
+        """Connect to the Sanctum daemon and authenticate."""
+        if isinstance(self.connection, UnixConnection):
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                self.connection.address
+            )
+        else:
+            host, port = self.connection.address
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+        self._write_lock = asyncio.Lock()
+        self._read_error = None
+        self._read_task = asyncio.ensure_future(self._read_loop(self._reader))
+        try:
+            await self._authenticate()
+        except BaseException:
+            await self._disconnect()
+            raise
+        return self
+
+    async def close(self) -> None:
+        """Release all tracked leases and disconnect."""
+        try:
+            if self._leases and self._writer is not None:
+                await self.release_leases(list(self._leases))
+        except VaultError:
+            pass
+        finally:
+            await self._disconnect()
+
+    async def _disconnect(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+        self._reader = None
+        self._session_id = None
+
+    async def __aenter__(self) -> "AsyncSanctumClient":
+        return await self.connect()
+
+    async def __aexit__(self, *exc: Any) -> bool:
+        await self.close()
+        return False
+
+    # -- RPC ----------------------------------------------------------------
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        error = VaultError("Connection closed", code="INTERNAL_ERROR")
+        try:
+            while True:
+                resp = await recv_stream(reader, self._max_message_size)
+                fut = self._pending.pop(resp.get("id"), None)
+                if fut is None:
+                    # No caller to hand this to (e.g. the daemon could not
+                    # parse a frame); the stream can no longer be trusted.
+                    raise_on_error(resp)
+                    raise VaultError(
+                        "Response for unknown request id", code="INTERNAL_ERROR"
+                    )
+                if not fut.done():
+                    fut.set_result(resp)
+        except VaultError as e:
+            error = e
+        except (asyncio.IncompleteReadError, OSError, ValueError):
+            pass
+        finally:
+            self._read_error = error
+            pending, self._pending = self._pending, {}
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(error)
+
+    async def _call(self, method: str, params: dict) -> dict:
+        if self._writer is None or self._write_lock is None:
+            raise VaultError("Not connected", code="INTERNAL_ERROR")
+        if self._read_error is not None:
+            raise VaultError(str(self._read_error), code=self._read_error.code)
+        self._req_id += 1
+        req_id = self._req_id
+        fut: "asyncio.Future[dict]" = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = fut
+        sent = False
+        try:
+            async with self._write_lock:
+                self._writer.write(
+                    frame_payload(encode_request(req_id, method, params))
+                )
+                sent = True
+                await self._writer.drain()
+            resp = await fut
+        finally:
+            # Once sent, the reader pops the id when the response arrives,
+            # even if this caller was cancelled in the meantime.
+            if not sent:
+                self._pending.pop(req_id, None)
+        raise_on_error(resp)
+        return resp.get("result", {})
+
+    # -- auth ---------------------------------------------------------------
+
+    async def _authenticate(self) -> None:
+        if self._peer_auth and isinstance(self.connection, UnixConnection):
+            try:
+                r = await self._call(
+                    "authenticate_peer", {"agent_name": self.agent_name}
+                )
+            except VaultError:
+                r = {}
+            if r.get("authenticated") and "session_id" in r:
+                self._capabilities = frozenset(r.get("capabilities") or ())
+                self._session_id = r["session_id"]
+                return
+            self._peer_auth = False
+        # Key files may need a KDF run; keep that off the event loop.
+        sk = await asyncio.get_running_loop().run_in_executor(None, self._keys._signer)
+        r = await self._call("authenticate", {"agent_name": self.agent_name})
+        self._capabilities = frozenset(r.get("capabilities") or ())
+        session_id = r["session_id"]
+        r = await self._call(
+            "challenge_response", {"session_id": session_id, **_sign_challenge(sk, r)}
+        )
+        if not r.get("authenticated"):
+            raise AuthError("Authentication not confirmed", code="AUTH_FAILED")
+        self._session_id = session_id
+
+    # -- operations ---------------------------------------------------------
+
+    def _retrieve_params(self, path: str, ttl: Optional[int]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"session_id": self._session_id, "path": path}
+        if ttl is not None:
+            params["ttl"] = ttl
+        return params
+
+    async def retrieve(self, path: str, *, ttl: Optional[int] = None) -> str:
+        """Retrieve a credential value as a UTF-8 string.
+
+        The lease is tracked and auto-released on :meth:`close`.
+        """
+        r = await self.retrieve_raw(path, ttl=ttl)
+        return _decode_value(r)
+
+    async def retrieve_raw(self, path: str, *, ttl: Optional[int] = None) -> dict:
+        """Like :meth:`retrieve` but returns the full result dict."""
+        r = await self._call("retrieve", self._retrieve_params(path, ttl))
+        self._leases[r["lease_id"]] = None
+        return r
+
+    async def retrieve_many(
+        self, paths: List[str], *, ttl: Optional[int] = None
+    ) -> Dict[str, str]:
+        """Retrieve several credentials concurrently.
+
+        Returns a ``{path: value}`` dict; the first error is raised after
+        all requests have completed.
+        """
+        unique = list(dict.fromkeys(paths))
+        results = await asyncio.gather(
+            *(self.retrieve(p, ttl=ttl) for p in unique), return_exceptions=True
+        )
+        values: Dict[str, str] = {}
+        for path, result in zip(unique, results):
+            if isinstance(result, BaseException):
+                raise result
+            values[path] = result
+        return values
+
+    async def list(self) -> list:
+        """List credentials the agent has access to."""
+        r = await self._call("list", {"session_id": self._session_id})
+        return r.get("credentials", [])
+
+    async def release_lease(self, lease_id: str) -> None:
+        """Explicitly release a credential lease."""
+        await self._call("release_lease", {"lease_id": lease_id})
+        self._leases.pop(lease_id, None)
+
+    async def release_leases(self, lease_ids: List[str]) -> None:
+        """Release several leases concurrently (or in one batch call)."""
+        if not lease_ids:
+            return
+        if "release_lease_batch" in self._capabilities:
+            await self._call("release_lease_batch", {"lease_ids": lease_ids})
+            for lid in lease_ids:
+                self._leases.pop(lid, None)
+            return
+        results = await asyncio.gather(
+            *(self.release_lease(lid) for lid in lease_ids), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def use_credential(
+        self,
+        path: str,
+        operation: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """Use a credential without retrieving it (the proxy pattern).
+
+        See :meth:`SanctumClient.use_credential` for supported operations.
+        """
+        rpc_params: Dict[str, Any] = {
+            "session_id": self._session_id,
+            "path": path,
+            "operation": operation,
+        }
+        if params:
+            rpc_params["params"] = params
+        return await self._call("use", rpc_params)
+
+    # Alias, mirroring SanctumClient.use
+    use = use_credential
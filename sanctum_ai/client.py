@@ -1,15 +1,56 @@
 """SanctumClient — the main entry point for AI agents to access Sanctum."""
 
+import base64
 import hashlib
 import os
+import queue
 import socket
-from typing import Any, Dict, List, Optional, Tuple, Union
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-from nacl.signing import SigningKey
+from nacl.exceptions import CryptoError
 from nacl.secret import SecretBox
 
+from sanctum_ai._crypto import Ed25519Signer
+from sanctum_ai.connection import resolve_connection
 from sanctum_ai.exceptions import AuthError, VaultError
-from sanctum_ai.protocol import send, recv, raise_on_error
+from sanctum_ai.protocol import (
+    MAX_MESSAGE_SIZE,
+    encode_request,
+    raise_on_error,
+    recv,
+    send_payloads,
+)
+from sanctum_ai.session import SessionCache
+
+try:
+    from argon2.low_level import Type as _Argon2Type, hash_secret_raw
+except ImportError:
+    hash_secret_raw = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from sanctum_ai.pool import SanctumConnectionPool
+
+# KDF identifiers for the header byte of encrypted key files. Files without
+# a header (the original 88-byte layout) use PBKDF2 with 100,000 iterations.
+KDF_PBKDF2_SHA256 = 0x01
+KDF_SCRYPT = 0x02
+KDF_ARGON2ID = 0x03
+
+# Cost parameters stored after the KDF byte, so they can be retuned without
+# breaking existing files: PBKDF2 (iterations), scrypt (n, r, p), argon2id
+# (time_cost, memory_cost in KiB, parallelism).
+_KDF_PARAMS = {
+    KDF_PBKDF2_SHA256: struct.Struct(">I"),
+    KDF_SCRYPT: struct.Struct(">III"),
+    KDF_ARGON2ID: struct.Struct(">III"),
+}
+
+# salt (16) + nonce (24) + ciphertext (32-byte seed + 16-byte MAC)
+_LEGACY_KEY_BLOB_SIZE = 88
 
 
 class SanctumClient:
@@ -28,6 +69,11 @@ class SanctumClient:
 
     DEFAULT_SOCKET = "~/.sanctum/vault.sock"
     DEFAULT_KEY_DIR = "~/.sanctum/keys"
+    DEFAULT_SESSION_CACHE = "~/.sanctum/session.json"
+    CACHE_MAX_ENTRIES = 256
+    # Requests in flight per pipelined write; small enough that a window's
+    # requests and responses both fit in the socket buffers.
+    PIPELINE_WINDOW = 64
 
     def __init__(
         self,
@@ -38,6 +84,11 @@ class SanctumClient:
         port: Optional[int] = None,
         key_path: Optional[str] = None,
         passphrase: Optional[str] = None,
+        session_cache: Union[bool, str] = False,
+        prefer_unix_socket: bool = True,
+        cache_ttl: Optional[int] = None,
+        max_message_size: int = MAX_MESSAGE_SIZE,
+        peer_auth: bool = False,
     ):
         self.agent_name = agent_name
         self._socket_path = socket_path
@@ -45,10 +96,43 @@ class SanctumClient:
         self._port = port
         self._key_path = key_path
         self._passphrase = passphrase
+        self._prefer_unix_socket = prefer_unix_socket
+        self._max_message_size = max_message_size
+        self._peer_auth = peer_auth
         self._sock: Optional[socket.socket] = None
         self._session_id: Optional[str] = None
         self._req_id = 0
-        self._leases: List[str] = []
+        # Insertion-ordered set of held lease ids (values unused).
+        self._leases: Dict[str, None] = {}
+        self._signing_key: Optional[Ed25519Signer] = None
+        self._capabilities: frozenset = frozenset()
+        self._pool: Optional["SanctumConnectionPool"] = None
+        self._session_cache: Optional[SessionCache] = None
+        if session_cache:
+            self._session_cache = SessionCache(
+                self.DEFAULT_SESSION_CACHE if session_cache is True else session_cache
+            )
+        # Serializes frames on the client's own socket across threads.
+        self._io_lock = threading.Lock()
+        # path -> (value, lease_id, refresh_at); see _cache_get/_cache_put.
+        self._cache_ttl = cache_ttl
+        self._cache: "OrderedDict[str, Tuple[str, str, float]]" = OrderedDict()
+        self._cache_guard = threading.Lock()
+        self._fetch_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def from_pool(cls, pool: "SanctumConnectionPool", **kwargs: Any) -> "SanctumClient":
+        """Create a client that borrows pre-authenticated connections.
+
+        :meth:`connect` checks a connection out of *pool* instead of dialing
+        and authenticating, and :meth:`close` returns it after releasing the
+        client's leases. Use one client per thread. Keyword arguments such
+        as ``cache_ttl`` are passed to the constructor; connection and key
+        settings come from the pool.
+        """
+        client = cls(pool.agent_name, **kwargs)
+        client._pool = pool
+        return client
 
     # -- lifecycle ----------------------------------------------------------
 
@@ -62,7 +146,13 @@ class SanctumClient:
             target: Optional override — a Unix socket path (str), a
                 ``(host, port)`` tuple, or a dict ``{"host": ..., "port": ...}``.
                 If *None*, uses constructor parameters or the default socket.
+                Ignored for clients created with :meth:`from_pool`.
         """
+        if self._pool is not None:
+            self._sock, self._session_id = self._pool.get()
+            self._capabilities = self._pool.capabilities
+            return self
+
         if target is not None:
             if isinstance(target, str):
                 self._socket_path = target
@@ -75,28 +165,40 @@ class SanctumClient:
                 self._host, self._port = target[0], target[1]
                 self._socket_path = None
 
-        if self._host and self._port:
-            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self._sock.connect((self._host, self._port))
-        else:
-            path = os.path.expanduser(self._socket_path or self.DEFAULT_SOCKET)
-            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            self._sock.connect(path)
-
+        self._sock = resolve_connection(
+            self._socket_path,
+            self._host,
+            self._port,
+            self.DEFAULT_SOCKET,
+            prefer_unix_socket=self._prefer_unix_socket,
+        ).open()
         self._authenticate()
         return self
 
     def close(self) -> None:
         """Release all tracked leases and disconnect."""
-        for lid in list(self._leases):
-            try:
-                self.release_lease(lid)
-            except VaultError:
-                pass
-        if self._sock:
-            self._sock.close()
-            self._sock = None
-        self._session_id = None
+        error: Optional[BaseException] = None
+        try:
+            if self._leases:
+                self.release_leases(list(self._leases))
+        except VaultError as e:
+            error = e
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if self._sock:
+                if self._pool is None:
+                    self._sock.close()
+                elif error is None:
+                    self._pool.put((self._sock, self._session_id))
+                else:
+                    # Same rule as pool.acquire(): reuse only after a
+                    # daemon-reported error, discard after anything else.
+                    self._pool._checkin((self._sock, self._session_id), error)
+                self._sock = None
+            self._session_id = None
+            self.invalidate()
 
     def __enter__(self) -> "SanctumClient":
         return self.connect()
@@ -111,17 +213,58 @@ class SanctumClient:
         self._req_id += 1
         return self._req_id
 
-    def _call(self, method: str, params: dict) -> dict:
-        if self._sock is None:
-            raise VaultError("Not connected", code="INTERNAL_ERROR")
-        send(self._sock, {"id": self._next_id(), "method": method, "params": params})
-        resp = recv(self._sock)
+    def _call(
+        self, method: str, params: dict, *, sock: Optional[socket.socket] = None
+    ) -> dict:
+        if sock is None:
+            with self._io_lock:
+                if self._sock is None:
+                    raise VaultError("Not connected", code="INTERNAL_ERROR")
+                resp = self._roundtrip(self._sock, method, params)
+        else:
+            resp = self._roundtrip(sock, method, params)
         raise_on_error(resp)
         return resp.get("result", {})
 
+    def _roundtrip(self, sock: socket.socket, method: str, params: dict) -> dict:
+        send_payloads(sock, [encode_request(self._next_id(), method, params)])
+        return recv(sock, self._max_message_size)
+
+    def _pipeline(self, calls: List[Tuple[str, dict]]) -> List[dict]:
+        """Send several requests back-to-back and collect their responses.
+
+        Frames go out in vectored writes of up to :attr:`PIPELINE_WINDOW`
+        requests, and each window's responses are read before the next is
+        sent, so neither side can block on a full socket buffer. Responses
+        are matched to requests by ``id`` so the daemon may answer in any
+        order. Returns the raw response dicts in request order, without
+        raising on errors.
+        """
+        by_id: Dict[Any, dict] = {}
+        ids = []
+        with self._io_lock:
+            if self._sock is None:
+                raise VaultError("Not connected", code="INTERNAL_ERROR")
+            for start in range(0, len(calls), self.PIPELINE_WINDOW):
+                window = calls[start : start + self.PIPELINE_WINDOW]
+                window_ids = [self._next_id() for _ in window]
+                send_payloads(
+                    self._sock,
+                    [
+                        encode_request(i, method, params)
+                        for i, (method, params) in zip(window_ids, window)
+                    ],
+                )
+                for _ in window_ids:
+                    resp = recv(self._sock, self._max_message_size)
+                    by_id[resp.get("id")] = resp
+                ids += window_ids
+        missing = {"error": {"code": "INTERNAL_ERROR", "message": "Missing response"}}
+        return [by_id.get(i, missing) for i in ids]
+
     # -- auth ---------------------------------------------------------------
 
-    def _resolve_key(self) -> SigningKey:
+    def _resolve_key(self) -> Ed25519Signer:
         if self._key_path:
             p = os.path.expanduser(self._key_path)
         else:
@@ -134,7 +277,7 @@ class SanctumClient:
         return self._load_signing_key(p)
 
     @staticmethod
-    def _load_signing_key(path: str) -> SigningKey:
+    def _load_signing_key(path: str) -> Ed25519Signer:
         with open(path, "r") as f:
             raw = f.read().strip()
         seed = bytes.fromhex(raw)
@@ -142,54 +285,357 @@ class SanctumClient:
             raise AuthError(
                 f"Key file has {len(seed)} bytes, expected 32", code="AUTH_FAILED"
             )
-        return SigningKey(seed)
+        return Ed25519Signer(seed)
 
     @staticmethod
-    def _load_encrypted_key(path: str, passphrase: str) -> SigningKey:
+    def _load_encrypted_key(path: str, passphrase: str) -> Ed25519Signer:
         with open(path, "r") as f:
             blob = bytes.fromhex(f.read().strip())
+        kdf, params = KDF_PBKDF2_SHA256, (100_000,)
+        if len(blob) != _LEGACY_KEY_BLOB_SIZE:
+            kdf = blob[0] if blob else 0
+            layout = _KDF_PARAMS.get(kdf)
+            if layout is None:
+                raise AuthError(f"Unknown key file KDF 0x{kdf:02x}", code="AUTH_FAILED")
+            try:
+                params = layout.unpack_from(blob, 1)
+            except struct.error:
+                raise AuthError(
+                    "Encrypted key file is truncated", code="AUTH_FAILED"
+                ) from None
+            blob = blob[1 + layout.size :]
         salt, nonce, ct = blob[:16], blob[16:40], blob[40:]
-        dk = hashlib.pbkdf2_hmac("sha256", passphrase.encode(), salt, 100_000, dklen=32)
-        box = SecretBox(dk)
-        seed = box.decrypt(ct, nonce)
-        return SigningKey(seed)
+        try:
+            kek = _derive_kek(passphrase.encode(), salt, kdf, params)
+        except (ValueError, OverflowError):
+            raise AuthError(
+                "Key file has invalid KDF parameters", code="AUTH_FAILED"
+            ) from None
+        box = SecretBox(kek)
+        try:
+            seed = box.decrypt(ct, nonce)
+        except (CryptoError, ValueError):
+            raise AuthError(
+                "Could not decrypt key file",
+                code="AUTH_FAILED",
+                suggestion="Check the passphrase and that the key file is intact",
+            ) from None
+        return Ed25519Signer(seed)
+
+    def _signer(self) -> Ed25519Signer:
+        # Key files (and the KDF for encrypted ones) are read once per client.
+        if self._signing_key is None:
+            self._signing_key = self._resolve_key()
+        return self._signing_key
 
     def _authenticate(self) -> None:
-        sk = self._resolve_key()
-        r = self._call("authenticate", {"agent_name": self.agent_name})
-        self._session_id = r["session_id"]
-        challenge = bytes.fromhex(r["challenge"])
-        sig = sk.sign(challenge).signature
+        self._session_id = self._handshake(self._sock)
+
+    def _handshake(self, sock: Optional[socket.socket]) -> str:
+        """Authenticate *sock* and return the session id.
+
+        Tries, in order: resuming a cached session (if a session cache is
+        configured), kernel peer-credential auth (Unix sockets only), and
+        finally Ed25519 challenge-response.
+        """
+        cache = self._session_cache
+        if cache is not None:
+            session_id = self._resume_session(cache, sock)
+            if session_id is not None:
+                return session_id
+        conn = sock if sock is not None else self._sock
+        if (
+            self._peer_auth
+            and conn is not None
+            and conn.family == getattr(socket, "AF_UNIX", None)
+        ):
+            session_id = self._authenticate_peer(sock)
+            if session_id is not None:
+                return session_id
+        sk = self._signer()
+        r = self._call("authenticate", {"agent_name": self.agent_name}, sock=sock)
+        self._capabilities = frozenset(r.get("capabilities") or ())
+        session_id = r["session_id"]
         r = self._call(
             "challenge_response",
-            {"session_id": self._session_id, "signature": sig.hex()},
+            {"session_id": session_id, **_sign_challenge(sk, r)},
+            sock=sock,
         )
         if not r.get("authenticated"):
             raise AuthError("Authentication not confirmed", code="AUTH_FAILED")
+        if cache is not None:
+            cache.store(self.agent_name, session_id, r.get("expires_at"))
+        return session_id
+
+    def _authenticate_peer(self, sock: Optional[socket.socket]) -> Optional[str]:
+        # Over a Unix socket the daemon can identify us from SO_PEERCRED,
+        # skipping the challenge round-trip and the key load/sign.
+        try:
+            r = self._call(
+                "authenticate_peer", {"agent_name": self.agent_name}, sock=sock
+            )
+        except VaultError:
+            r = {}
+        if not r.get("authenticated") or "session_id" not in r:
+            # Unsupported or not mapped for this agent; don't retry per connect.
+            self._peer_auth = False
+            return None
+        self._capabilities = frozenset(r.get("capabilities") or ())
+        return r["session_id"]
+
+    def _resume_session(
+        self, cache: SessionCache, sock: Optional[socket.socket]
+    ) -> Optional[str]:
+        session_id = cache.load(self.agent_name)
+        if session_id is None:
+            return None
+        try:
+            r = self._call("resume_session", {"session_id": session_id}, sock=sock)
+        except VaultError:
+            r = {}
+        if r.get("authenticated"):
+            self._capabilities = frozenset(r.get("capabilities") or ())
+            return session_id
+        cache.discard(self.agent_name)
+        return None
 
     # -- operations ---------------------------------------------------------
 
+    def _retrieve_params(
+        self, path: str, ttl: Optional[int], session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "session_id": session_id or self._session_id,
+            "path": path,
+        }
+        if ttl is not None:
+            params["ttl"] = ttl
+        return params
+
     def retrieve(self, path: str, *, ttl: Optional[int] = None) -> str:
         """Retrieve a credential value as a UTF-8 string.
 
-        The lease is tracked and auto-released on :meth:`close`.
+        The lease is tracked and auto-released on :meth:`close`. With
+        ``cache_ttl`` set, values are served from the client-side cache for
+        the first two thirds of their lifetime, and concurrent retrievals
+        of the same path share one daemon round-trip.
         """
-        params: Dict[str, Any] = {"session_id": self._session_id, "path": path}
-        if ttl is not None:
-            params["ttl"] = ttl
-        r = self._call("retrieve", params)
-        self._leases.append(r["lease_id"])
-        return bytes.fromhex(r["value"]).decode("utf-8", errors="replace")
+        if self._cache_ttl is None:
+            return self._fetch(path, ttl)
+        value = self._cache_get(path)
+        if value is not None:
+            return value
+        lock = self._fetch_lock(path)
+        try:
+            with lock:
+                # Another thread may have filled the entry while we waited.
+                value = self._cache_get(path)
+                if value is None:
+                    value = self._fetch(path, ttl)
+                return value
+        finally:
+            # Threads still waiting hold their own reference to the lock.
+            with self._cache_guard:
+                if self._fetch_locks.get(path) is lock:
+                    del self._fetch_locks[path]
+
+    def _fetch(self, path: str, ttl: Optional[int]) -> str:
+        r = self._call("retrieve", self._retrieve_params(path, ttl))
+        self._leases[r["lease_id"]] = None
+        value = _decode_value(r)
+        self._cache_put(path, value, r, ttl)
+        return value
 
     def retrieve_raw(self, path: str, *, ttl: Optional[int] = None) -> dict:
         """Like :meth:`retrieve` but returns the full result dict."""
-        params: Dict[str, Any] = {"session_id": self._session_id, "path": path}
-        if ttl is not None:
-            params["ttl"] = ttl
-        r = self._call("retrieve", params)
-        self._leases.append(r["lease_id"])
+        r = self._call("retrieve", self._retrieve_params(path, ttl))
+        self._leases[r["lease_id"]] = None
         return r
 
+    def retrieve_many(
+        self, paths: List[str], *, ttl: Optional[int] = None
+    ) -> Dict[str, str]:
+        """Retrieve several credentials in a single pipelined round-trip.
+
+        Returns a ``{path: value}`` dict. Every successful lease is tracked,
+        even if another path fails; the first error is raised afterwards.
+        """
+        values: Dict[str, str] = {}
+        unique = []
+        for path in dict.fromkeys(paths):
+            cached = self._cache_get(path)
+            if cached is None:
+                unique.append(path)
+            else:
+                values[path] = cached
+        if not unique:
+            return values
+        responses = self._pipeline(
+            [("retrieve", self._retrieve_params(p, ttl)) for p in unique]
+        )
+        error: Optional[VaultError] = None
+        for path, resp in zip(unique, responses):
+            try:
+                raise_on_error(resp)
+            except VaultError as e:
+                error = error or e
+                continue
+            r = resp.get("result", {})
+            self._leases[r["lease_id"]] = None
+            values[path] = _decode_value(r)
+            self._cache_put(path, values[path], r, ttl)
+        if error is not None:
+            raise error
+        return values
+
+    def retrieve_parallel(
+        self, paths: List[str], *, ttl: Optional[int] = None, max_workers: int = 8
+    ) -> Dict[str, str]:
+        """Retrieve several credentials concurrently over pooled connections.
+
+        For clients created with :meth:`from_pool`, up to *max_workers*
+        threads each drive their own pooled connection (this client's
+        connection plus any idle ones in the pool), so total latency is
+        close to that of the slowest single retrieval. Other clients fall
+        back to :meth:`retrieve_many`. Returns a ``{path: value}`` dict; the
+        first error is raised after all paths have been attempted.
+
+        Each pooled connection has its own session, so leases taken on the
+        extra connections are released there before the connection goes
+        back to the pool; only this client's own leases are tracked and
+        cached.
+        """
+        if self._pool is None:
+            return self.retrieve_many(paths, ttl=ttl)
+        values: Dict[str, str] = {}
+        work: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        for path in dict.fromkeys(paths):
+            cached = self._cache_get(path)
+            if cached is None:
+                work.put(path)
+            else:
+                values[path] = cached
+        if work.empty():
+            return values
+        errors: Dict[str, VaultError] = {}
+
+        def drain(sock: Optional[socket.socket], session_id: Optional[str]) -> None:
+            lane_leases: List[str] = []
+            while True:
+                try:
+                    path = work.get_nowait()
+                except queue.Empty:
+                    break
+                params = self._retrieve_params(path, ttl, session_id)
+                try:
+                    r = self._call("retrieve", params, sock=sock)
+                except VaultError as e:
+                    errors[path] = e
+                    continue
+                values[path] = _decode_value(r)
+                if sock is None:
+                    self._leases[r["lease_id"]] = None
+                    self._cache_put(path, values[path], r, ttl)
+                else:
+                    lane_leases.append(r["lease_id"])
+            if sock is not None:
+                self._release_on(sock, lane_leases)
+
+        # Imported here: concurrent.futures is slow to import and rarely used.
+        from concurrent.futures import ThreadPoolExecutor
+
+        lanes = min(max_workers, work.qsize())
+        with self._pool.batch(lanes - 1) as extra:
+            # This client's own connection (sock=None) is always a lane.
+            conns: List[Tuple[Optional[socket.socket], Optional[str]]] = [
+                (None, self._session_id),
+                *extra,
+            ]
+            with ThreadPoolExecutor(max_workers=len(conns)) as executor:
+                for future in [executor.submit(drain, *c) for c in conns]:
+                    future.result()
+        for path in dict.fromkeys(paths):
+            if path in errors:
+                raise errors[path]
+        return values
+
+    def _release_on(self, sock: socket.socket, lease_ids: List[str]) -> None:
+        # Best effort, as in close(): a lease that fails to release expires
+        # on its own.
+        if not lease_ids:
+            return
+        if "release_lease_batch" in self._capabilities:
+            calls = [("release_lease_batch", {"lease_ids": lease_ids})]
+        else:
+            calls = [("release_lease", {"lease_id": lid}) for lid in lease_ids]
+        for method, params in calls:
+            try:
+                self._call(method, params, sock=sock)
+            except VaultError:
+                pass
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop *path* (or every path) from the client-side cache.
+
+        Call this when a credential is rotated so the next :meth:`retrieve`
+        goes to the daemon.
+        """
+        with self._cache_guard:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(path, None)
+
+    # -- client-side cache --------------------------------------------------
+
+    def _fetch_lock(self, path: str) -> threading.Lock:
+        with self._cache_guard:
+            lock = self._fetch_locks.get(path)
+            if lock is None:
+                lock = self._fetch_locks[path] = threading.Lock()
+            return lock
+
+    def _cache_get(self, path: str) -> Optional[str]:
+        if self._cache_ttl is None:
+            return None
+        with self._cache_guard:
+            entry = self._cache.get(path)
+            if entry is None or time.monotonic() >= entry[2]:
+                return None
+            self._cache.move_to_end(path)
+            return entry[0]
+
+    def _cache_put(
+        self, path: str, value: str, result: dict, ttl: Optional[int]
+    ) -> None:
+        if self._cache_ttl is None:
+            return
+        # The entry lives no longer than the lease backing it, and is
+        # refreshed once two thirds of that lifetime have passed.
+        lifetime: float = self._cache_ttl
+        if ttl is not None:
+            lifetime = min(lifetime, ttl)
+        expires_at = result.get("expires_at")
+        if isinstance(expires_at, (int, float)):
+            lifetime = min(lifetime, expires_at - time.time())
+        if lifetime <= 0:
+            return
+        refresh_at = time.monotonic() + lifetime * 2 / 3
+        with self._cache_guard:
+            self._cache[path] = (value, result["lease_id"], refresh_at)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def _cache_drop_leases(self, lease_ids: List[str]) -> None:
+        # A released lease no longer backs its cached value.
+        if not self._cache:
+            return
+        released = set(lease_ids)
+        with self._cache_guard:
+            for path in [p for p, e in self._cache.items() if e[1] in released]:
+                del self._cache[path]
+
     def list(self) -> list:
         """List credentials the agent has access to."""
         r = self._call("list", {"session_id": self._session_id})
@@ -198,8 +644,40 @@ class SanctumClient:
     def release_lease(self, lease_id: str) -> None:
         """Explicitly release a credential lease."""
         self._call("release_lease", {"lease_id": lease_id})
-        if lease_id in self._leases:
-            self._leases.remove(lease_id)
+        self._leases.pop(lease_id, None)
+        self._cache_drop_leases([lease_id])
+
+    def release_leases(self, lease_ids: List[str]) -> None:
+        """Release several leases in one round-trip.
+
+        Uses the daemon's ``release_lease_batch`` method when advertised,
+        otherwise pipelines individual ``release_lease`` calls. Leases that
+        fail to release stay tracked; the first error is raised afterwards.
+        """
+        if not lease_ids:
+            return
+        if "release_lease_batch" in self._capabilities:
+            self._call("release_lease_batch", {"lease_ids": lease_ids})
+            for lid in lease_ids:
+                self._leases.pop(lid, None)
+            self._cache_drop_leases(lease_ids)
+            return
+        responses = self._pipeline(
+            [("release_lease", {"lease_id": lid}) for lid in lease_ids]
+        )
+        error: Optional[VaultError] = None
+        released = []
+        for lid, resp in zip(lease_ids, responses):
+            try:
+                raise_on_error(resp)
+            except VaultError as e:
+                error = error or e
+                continue
+            self._leases.pop(lid, None)
+            released.append(lid)
+        self._cache_drop_leases(released)
+        if error is not None:
+            raise error
 
     def use_credential(
         self,
@@ -241,3 +719,86 @@ class SanctumClient:
 
     # Backwards-compatible alias
     use = use_credential
+
+
+def _sign_challenge(sk: Ed25519Signer, result: dict) -> Dict[str, str]:
+    """Sign an ``authenticate`` challenge, answering in the daemon's encoding."""
+    if "challenge_b64" in result:
+        sig = sk.sign(base64.b64decode(result["challenge_b64"]))
+        return {"signature_b64": base64.b64encode(sig).decode()}
+    sig = sk.sign(bytes.fromhex(result["challenge"]))
+    return {"signature": sig.hex()}
+
+
+def _decode_value(result: dict) -> str:
+    # Daemons may send base64 (``value_b64``) instead of hex to save space.
+    if "value_b64" in result:
+        raw = base64.b64decode(result["value_b64"])
+    else:
+        raw = bytes.fromhex(result["value"])
+    return raw.decode("utf-8", errors="replace")
+
+
+# Derived KEKs for the life of the process, so new clients and reconnects
+# that load the same encrypted key file skip the KDF. Keyed by a hash of
+# the passphrase; the passphrase itself is never stored.
+_KEK_CACHE_SIZE = 8
+_kek_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_kek_cache_lock = threading.Lock()
+
+
+def _derive_kek(
+    passphrase: bytes,
+    salt: bytes,
+    kdf: int = KDF_PBKDF2_SHA256,
+    params: Tuple[int, ...] = (100_000,),
+) -> bytes:
+    key = (hashlib.sha256(passphrase).digest(), salt, kdf, params)
+    with _kek_cache_lock:
+        kek = _kek_cache.get(key)
+        if kek is not None:
+            _kek_cache.move_to_end(key)
+            return kek
+    kek = _run_kdf(passphrase, salt, kdf, params)
+    with _kek_cache_lock:
+        _kek_cache[key] = kek
+        while len(_kek_cache) > _KEK_CACHE_SIZE:
+            _kek_cache.popitem(last=False)
+    return kek
+
+
+def _run_kdf(
+    passphrase: bytes, salt: bytes, kdf: int, params: Tuple[int, ...]
+) -> bytes:
+    if kdf == KDF_PBKDF2_SHA256:
+        (iterations,) = params
+        return hashlib.pbkdf2_hmac("sha256", passphrase, salt, iterations, dklen=32)
+    if kdf == KDF_SCRYPT:
+        n, r, p = params
+        return hashlib.scrypt(
+            passphrase,
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=128 * r * (n + p + 2) + 2**20,
+            dklen=32,
+        )
+    if kdf == KDF_ARGON2ID:
+        if hash_secret_raw is None:
+            raise AuthError(
+                "Key file uses argon2id but argon2-cffi is not installed",
+                code="AUTH_FAILED",
+                suggestion="pip install sanctum-ai[argon2]",
+            )
+        time_cost, memory_cost, parallelism = params
+        return hash_secret_raw(
+            passphrase,
+            salt,
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            hash_len=32,
+            type=_Argon2Type.ID,
+        )
+    raise AuthError(f"Unknown key file KDF 0x{kdf:02x}", code="AUTH_FAILED")
@@ -0,0 +1,104 @@
+"""Transport addresses for the Sanctum daemon (Unix socket or TCP)."""
+
+import logging
+import os
+import select
+import socket
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
+
+
+class Connection:
+    """A dialable daemon address. Subclasses set ``family`` or override open()."""
+
+    family: int
+
+    def __init__(self, address: Union[str, Tuple[str, int]]):
+        self.address = address
+
+    def open(self) -> socket.socket:
+        """Create a connected stream socket to the daemon."""
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.address)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.address!r})"
+
+
+class UnixConnection(Connection):
+    """Unix domain socket transport."""
+
+    # Not defined on some Windows builds; socket() then fails at open time.
+    family = getattr(socket, "AF_UNIX", -1)
+
+    def __init__(self, path: str):
+        super().__init__(os.path.expanduser(path))
+
+
+class TCPConnection(Connection):
+    """TCP transport over IPv4 or IPv6, whichever the host resolves to."""
+
+    def __init__(self, host: str, port: int):
+        super().__init__((host, port))
+
+    def open(self) -> socket.socket:
+        # create_connection() picks the family from getaddrinfo, so "::1"
+        # and IPv6-only hosts work as well as IPv4 ones.
+        sock = socket.create_connection(self.address)
+        try:
+            # RPCs are small request/response frames; Nagle plus delayed
+            # ACK would otherwise stall each one.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+
+def resolve_connection(
+    socket_path: Optional[str],
+    host: Optional[str],
+    port: Optional[int],
+    default_socket: str,
+    *,
+    prefer_unix_socket: bool = True,
+) -> Connection:
+    """Pick the transport for the given client parameters.
+
+    TCP is used when both *host* and *port* are set, otherwise the Unix
+    socket at *socket_path* (or *default_socket*). With *prefer_unix_socket*,
+    a loopback TCP target is upgraded to that Unix socket when it exists,
+    avoiding the TCP stack for a same-host daemon.
+    """
+    path = os.path.expanduser(socket_path or default_socket)
+    if host and port:
+        if not (
+            prefer_unix_socket
+            and host in LOOPBACK_HOSTS
+            and hasattr(socket, "AF_UNIX")
+            and os.path.exists(path)
+        ):
+            return TCPConnection(host, port)
+        logger.debug("Using Unix socket %s instead of %s:%s", path, host, port)
+    return UnixConnection(path)
+
+
+def is_dropped(sock: socket.socket) -> bool:
+    """Return True if an idle socket was closed by the peer.
+
+    An idle RPC connection should never be readable; readability means
+    either EOF or unsolicited data, and neither is safe to reuse.
+    """
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
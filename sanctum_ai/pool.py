@@ -0,0 +1,189 @@
+"""SanctumConnectionPool — reuse authenticated daemon connections."""
+
+import queue
+import socket
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+from sanctum_ai.client import SanctumClient
+from sanctum_ai.connection import is_dropped, resolve_connection
+from sanctum_ai.exceptions import VaultError
+
+PooledConnection = Tuple[socket.socket, str]
+
+
+class SanctumConnectionPool:
+    """Bounded pool of pre-authenticated connections for one agent.
+
+    Connections are opened and authenticated lazily, handed out with
+    :meth:`get`/:meth:`acquire`, and kept open for reuse once returned, so
+    each socket pays the Ed25519 challenge-response only once. At most
+    *maxsize* connections exist at a time; when all are checked out,
+    :meth:`get` blocks (or raises if ``block=False``).
+
+    Usage::
+
+        with SanctumConnectionPool("my-agent", maxsize=4) as pool:
+            with SanctumClient.from_pool(pool) as client:
+                secret = client.retrieve("openai/api_key")
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        *,
+        socket_path: Optional[str] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        key_path: Optional[str] = None,
+        passphrase: Optional[str] = None,
+        prefer_unix_socket: bool = True,
+        peer_auth: bool = False,
+        maxsize: int = 4,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        self.agent_name = agent_name
+        self.connection = resolve_connection(
+            socket_path,
+            host,
+            port,
+            SanctumClient.DEFAULT_SOCKET,
+            prefer_unix_socket=prefer_unix_socket,
+        )
+        self._auth = SanctumClient(
+            agent_name, key_path=key_path, passphrase=passphrase, peer_auth=peer_auth
+        )
+        self._block = block
+        self._timeout = timeout
+        self._closed = False
+        # LIFO keeps the most recently used (warmest) connections in play.
+        # Empty slots are None and are filled on demand.
+        self._pool: "queue.LifoQueue[Optional[PooledConnection]]" = queue.LifoQueue(
+            maxsize
+        )
+        for _ in range(maxsize):
+            self._pool.put(None)
+
+    @property
+    def capabilities(self) -> frozenset:
+        """Optional daemon features advertised during authentication."""
+        return self._auth._capabilities
+
+    def _new_conn(self) -> PooledConnection:
+        sock = self.connection.open()
+        try:
+            session_id = self._auth._handshake(sock)
+        except BaseException:
+            sock.close()
+            raise
+        return sock, session_id
+
+    def get(self) -> PooledConnection:
+        """Check out an authenticated ``(sock, session_id)`` connection."""
+        if self._closed:
+            raise VaultError("Connection pool is closed", code="INTERNAL_ERROR")
+        try:
+            conn = self._pool.get(block=self._block, timeout=self._timeout)
+        except queue.Empty:
+            raise VaultError(
+                "Connection pool exhausted", code="INTERNAL_ERROR"
+            ) from None
+        return self._ready(conn)
+
+    def _ready(self, conn: Optional[PooledConnection]) -> PooledConnection:
+        # Turn a slot taken from the queue into a live, authenticated
+        # connection; on failure the slot goes back as empty.
+        if conn is not None and is_dropped(conn[0]):
+            conn[0].close()
+            conn = None
+        if conn is None:
+            try:
+                conn = self._new_conn()
+            except BaseException:
+                self._pool.put(None)
+                raise
+        return conn
+
+    def put(self, conn: PooledConnection) -> None:
+        """Return a connection obtained from :meth:`get`."""
+        if self._closed:
+            conn[0].close()
+            return
+        self._pool.put(conn)
+
+    def discard(self, conn: PooledConnection) -> None:
+        """Close a checked-out connection instead of returning it."""
+        conn[0].close()
+        if not self._closed:
+            self._pool.put(None)
+
+    @contextmanager
+    def acquire(self) -> Iterator[PooledConnection]:
+        """Context manager around :meth:`get`/:meth:`put`.
+
+        The connection is discarded rather than reused if the block raises
+        anything other than a daemon-reported error, since the socket may
+        be left mid-frame.
+        """
+        conn = self.get()
+        try:
+            yield conn
+        except BaseException as e:
+            self._checkin(conn, e)
+            raise
+        else:
+            self.put(conn)
+
+    @contextmanager
+    def batch(self, n: int) -> Iterator[List[PooledConnection]]:
+        """Check out up to *n* connections without waiting.
+
+        Yields only the connections that were free (possibly none), so a
+        caller that already holds a connection can never deadlock on the
+        pool. All are returned on exit, as with :meth:`acquire`.
+        """
+        conns: List[PooledConnection] = []
+        try:
+            for _ in range(max(n, 0)):
+                if self._closed:
+                    break
+                try:
+                    slot = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                conns.append(self._ready(slot))
+            yield conns
+        except BaseException as e:
+            for conn in conns:
+                self._checkin(conn, e)
+            raise
+        else:
+            for conn in conns:
+                self.put(conn)
+
+    def _checkin(self, conn: PooledConnection, exc: BaseException) -> None:
+        # Daemon-reported errors leave the socket in a clean state; anything
+        # else may have interrupted a frame mid-way.
+        if isinstance(exc, VaultError) and exc.code != "INTERNAL_ERROR":
+            self.put(conn)
+        else:
+            self.discard(conn)
+
+    def close(self) -> None:
+        """Close all idle connections. Checked-out ones close on return."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if conn is not None:
+                conn[0].close()
+
+    def __enter__(self) -> "SanctumConnectionPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.close()
+        return False
@@ -1,44 +1,157 @@
 """Wire-level helpers for the Sanctum JSON-RPC protocol.
 
 Framing: 4-byte big-endian length prefix followed by a JSON payload.
+
+JSON is handled by ``orjson`` when it is installed (``pip install
+sanctum-ai[fast]``) and by the standard library otherwise.
 """
 
 import json
 import socket
 import struct
-from typing import Dict
+from json.encoder import encode_basestring_ascii as _encode_json_str
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from sanctum_ai.exceptions import VaultError, CODE_TO_EXCEPTION
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MiB
 
+# Buffers per sendmsg call; Linux and macOS both allow 1024.
+_IOV_MAX = 1024
+
+# Frame length prefix, compiled once rather than on every pack/unpack.
+_U32 = struct.Struct(">I")
+
+_loads: Callable[[Any], Any]
+_dumps: Callable[[Any], bytes]
+
+if orjson is not None:
+    _dumps = orjson.dumps  # always compact
+    _loads = orjson.loads
+else:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+
+def _dumps_scalar(value: Any) -> bytes:
+    # Template fields are almost always str or int; encode those without a
+    # full json.dumps() call, which would use the same string escaper.
+    if type(value) is str:
+        return _encode_json_str(value).encode()
+    if type(value) is int:
+        return b"%d" % value
+    return _dumps(value)
+
+
+# Fixed-shape request envelopes, filled in with bytes %-formatting.
+_RETRIEVE_TEMPLATE = (
+    b'{"id":%d,"method":"retrieve","params":{"session_id":%s,"path":%s%s}}'
+)
+
+
+def _encode_retrieve(req_id: int, params: dict) -> Optional[bytes]:
+    keys = tuple(params)
+    if keys == ("session_id", "path"):
+        ttl = b""
+    elif keys == ("session_id", "path", "ttl"):
+        ttl = b',"ttl":' + _dumps_scalar(params["ttl"])
+    else:
+        return None
+    return _RETRIEVE_TEMPLATE % (
+        req_id,
+        _dumps_scalar(params["session_id"]),
+        _dumps_scalar(params["path"]),
+        ttl,
+    )
+
+
+# Per-method encoders for hot RPCs; each returns None for params it does
+# not recognize, falling back to the generic encoder. Only used with the
+# stdlib encoder: a single orjson.dumps of the whole envelope is faster.
+_REQUEST_ENCODERS: Dict[str, Callable[[int, dict], Optional[bytes]]] = {}
+if orjson is None:
+    _REQUEST_ENCODERS["retrieve"] = _encode_retrieve
+
+
+def encode_request(req_id: int, method: str, params: dict) -> bytes:
+    """Encode a JSON-RPC request payload (without the length prefix).
+
+    The output is the same as encoding the full request dict, but hot
+    methods are rendered from a precompiled template instead of building
+    and serializing the whole envelope.
+    """
+    encoder = _REQUEST_ENCODERS.get(method)
+    if encoder is not None:
+        payload = encoder(req_id, params)
+        if payload is not None:
+            return payload
+    return _dumps({"id": req_id, "method": method, "params": params})
+
 
 def send(sock: socket.socket, obj: dict) -> None:
     """Encode and send a length-prefixed JSON-RPC message."""
-    payload = json.dumps(obj, separators=(",", ":")).encode()
-    sock.sendall(struct.pack(">I", len(payload)) + payload)
+    send_payloads(sock, [_dumps(obj)])
+
 
+def send_payloads(sock: socket.socket, payloads: List[bytes]) -> None:
+    """Send already-encoded JSON payloads, each with its length prefix.
+
+    Headers and payloads are handed to the kernel as one scatter-gather
+    write (``sendmsg``) instead of being joined into a new buffer first.
+    """
+    iov: List[Union[bytes, memoryview]] = []
+    for payload in payloads:
+        iov.append(_U32.pack(len(payload)))
+        iov.append(payload)
+    if not hasattr(sock, "sendmsg"):  # e.g. Windows
+        sock.sendall(b"".join(iov))
+        return
+    start = 0
+    while start < len(iov):
+        sent = sock.sendmsg(iov[start : start + _IOV_MAX])
+        # Skip fully written buffers and trim a partially written one.
+        while start < len(iov) and sent >= len(iov[start]):
+            sent -= len(iov[start])
+            start += 1
+        if sent:
+            iov[start] = memoryview(iov[start])[sent:]
 
-def recv(sock: socket.socket) -> dict:
-    """Read a length-prefixed JSON-RPC message from the socket."""
-    length = struct.unpack(">I", _read_exact(sock, 4))[0]
-    if length > MAX_MESSAGE_SIZE:
-        raise VaultError("Response too large", code="INTERNAL_ERROR")
-    return json.loads(_read_exact(sock, length))
+
+def recv(sock: socket.socket, max_size: int = MAX_MESSAGE_SIZE) -> dict:
+    """Read a length-prefixed JSON-RPC message from the socket.
+
+    The length is checked against *max_size* before anything is allocated,
+    and the body is parsed straight from the receive buffer.
+    """
+    length = _U32.unpack(_read_exact(sock, 4))[0]
+    _check_length(length, max_size)
+    return _loads(_read_exact(sock, length))
 
 
 def raise_on_error(resp: dict) -> None:
     """Inspect an RPC response and raise a typed exception on error."""
+    # Called for every response; keep the success path to one dict lookup.
     err = resp.get("error")
-    if err is None:
-        return
+    if err is not None:
+        raise _error_from(err)
+
+
+def _error_from(err: Union[str, dict]) -> VaultError:
     # Legacy string errors
     if isinstance(err, str):
-        raise VaultError(err)
+        return VaultError(err)
     # Structured errors
     code = err.get("code", "INTERNAL_ERROR")
     cls = CODE_TO_EXCEPTION.get(code, VaultError)
-    raise cls(
+    return cls(
         err.get("message", "Unknown error"),
         code=code,
         detail=err.get("detail"),
@@ -50,26 +163,43 @@ def raise_on_error(resp: dict) -> None:
 
 def encode_frame(obj: dict) -> bytes:
     """Encode a dict into a length-prefixed frame (useful for testing)."""
-    payload = json.dumps(obj, separators=(",", ":")).encode()
-    return struct.pack(">I", len(payload)) + payload
+    return frame_payload(_dumps(obj))
+
+
+def frame_payload(payload: bytes) -> bytes:
+    """Prefix an already-encoded JSON payload with its length."""
+    return _U32.pack(len(payload)) + payload
 
 
 def decode_frame(data: bytes) -> tuple:
     """Decode a length-prefixed frame, returning (dict, remaining_bytes)."""
     if len(data) < 4:
         raise VaultError("Incomplete frame header", code="INTERNAL_ERROR")
-    length = struct.unpack(">I", data[:4])[0]
+    length = _U32.unpack_from(data, 0)[0]
     if len(data) < 4 + length:
         raise VaultError("Incomplete frame body", code="INTERNAL_ERROR")
-    obj = json.loads(data[4 : 4 + length])
+    obj = _loads(data[4 : 4 + length])
     return obj, data[4 + length :]
 
 
-def _read_exact(sock: socket.socket, n: int) -> bytes:
-    buf = bytearray()
-    while len(buf) < n:
-        chunk = sock.recv(n - len(buf))
-        if not chunk:
+def _check_length(length: int, max_size: int) -> None:
+    if length > max_size:
+        raise VaultError(
+            "Response too large",
+            code="INTERNAL_ERROR",
+            detail=f"{length} bytes exceeds the {max_size}-byte limit",
+            suggestion="Raise max_message_size on the client",
+        )
+
+
+def _read_exact(sock: socket.socket, n: int) -> bytearray:
+    # Read straight into one preallocated buffer; no per-chunk bytes objects.
+    buf = bytearray(n)
+    view = memoryview(buf)
+    off = 0
+    while off < n:
+        k = sock.recv_into(view[off:])
+        if not k:
             raise VaultError("Connection closed", code="INTERNAL_ERROR")
-        buf.extend(chunk)
-    return bytes(buf)
+        off += k
+    return buf
@@ -0,0 +1,97 @@
+"""On-disk cache of daemon session ids, used to resume sessions on reconnect."""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class SessionCache:
+    """JSON file mapping agent names to ``{"session_id", "expires_at"}``.
+
+    The file is private (mode 0600) and replaced atomically on every write;
+    read-modify-write cycles are serialized across processes with ``flock``
+    on a sidecar lock file where available. The cache is best-effort: I/O
+    errors are treated as a miss and never surface to the caller.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(os.path.expanduser(path))
+
+    def load(self, agent_name: str) -> Optional[str]:
+        """Return the cached session id for *agent_name* unless expired."""
+        entry = self._read().get(agent_name)
+        if not isinstance(entry, dict):
+            return None
+        expires_at = entry.get("expires_at")
+        if isinstance(expires_at, (int, float)) and expires_at <= time.time():
+            return None
+        session_id = entry.get("session_id")
+        return session_id if isinstance(session_id, str) else None
+
+    def store(
+        self, agent_name: str, session_id: str, expires_at: Optional[float] = None
+    ) -> None:
+        """Record a freshly authenticated session for *agent_name*."""
+        if not isinstance(expires_at, (int, float)):
+            expires_at = None
+        try:
+            with self._locked():
+                data = self._read()
+                data[agent_name] = {"session_id": session_id, "expires_at": expires_at}
+                self._write(data)
+        except OSError:
+            pass
+
+    def discard(self, agent_name: str) -> None:
+        """Forget the cached session for *agent_name*."""
+        try:
+            with self._locked():
+                data = self._read()
+                if data.pop(agent_name, None) is not None:
+                    self._write(data)
+        except OSError:
+            pass
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.path)
+        # mkstemp creates the file with mode 0600.
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".session-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
@@ -0,0 +1,193 @@
+"""An in-process fake Sanctum daemon for client tests."""
+
+import base64
+import itertools
+import os
+import socket
+import threading
+import time
+
+from nacl.signing import SigningKey
+
+from sanctum_ai.protocol import recv, send
+
+
+SECRETS = {"openai/api-key": "sk-test", "github/token": "ghp_test"}
+SEED = bytes(range(32))
+
+
+def write_key(directory) -> str:
+    """Write the test agent's plaintext key file and return its path."""
+    path = os.path.join(str(directory), "test-agent.key")
+    with open(path, "w") as f:
+        f.write(SEED.hex())
+    return path
+
+
+class FakeDaemon:
+    """Answers JSON-RPC requests on a single connected socket.
+
+    Requests are read in groups of ``batch`` and answered in reverse order,
+    which exercises id-based response matching.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        batch: int = 1,
+        sessions=None,
+        b64: bool = False,
+        capabilities=(),
+        lease_ids=None,
+        peer_auth: bool = False,
+    ):
+        self._sock = sock
+        self.batch = batch
+        self.b64 = b64
+        self.capabilities = list(capabilities)
+        self.peer_auth = peer_auth
+        self.sessions = set() if sessions is None else sessions
+        self.requests = []
+        self.leases = []  # lease ids issued on this connection
+        # Lease ids are unique across every connection to one server.
+        self._lease_ids = itertools.count(1) if lease_ids is None else lease_ids
+        self._sessions = 0
+        self._verify_key = SigningKey(SEED).verify_key
+        self._challenge = os.urandom(32)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def pair(cls, batch: int = 1, **kwargs):
+        """Return ``(client_sock, daemon)`` connected via a socketpair."""
+        client_sock, server_sock = socket.socketpair()
+        return client_sock, cls(server_sock, batch, **kwargs)
+
+    def _serve(self):
+        while True:
+            pending = []
+            try:
+                for _ in range(self.batch):
+                    pending.append(recv(self._sock))
+            except Exception:
+                return
+            self.requests.extend(pending)
+            for req in reversed(pending):
+                send(self._sock, self.handle(req))
+
+    def handle(self, req):
+        method, params = req["method"], req["params"]
+        handler = getattr(self, "rpc_" + method, None)
+        if handler is None:
+            return self.error(req, "INTERNAL_ERROR", f"unknown method {method}")
+        return handler(req, params)
+
+    @staticmethod
+    def error(req, code, message):
+        return {"id": req["id"], "error": {"code": code, "message": message}}
+
+    def rpc_authenticate(self, req, params):
+        self._sessions += 1
+        session_id = f"session-{id(self)}-{self._sessions}"
+        self.sessions.add(session_id)
+        result = {"session_id": session_id, "capabilities": self.capabilities}
+        if self.b64:
+            result["challenge_b64"] = base64.b64encode(self._challenge).decode()
+        else:
+            result["challenge"] = self._challenge.hex()
+        return {"id": req["id"], "result": result}
+
+    def rpc_authenticate_peer(self, req, params):
+        if not self.peer_auth:
+            return self.error(req, "INTERNAL_ERROR", "unknown method")
+        self._sessions += 1
+        return {
+            "id": req["id"],
+            "result": {"authenticated": True, "session_id": f"peer-{self._sessions}"},
+        }
+
+    def rpc_challenge_response(self, req, params):
+        if self.b64:
+            sig = base64.b64decode(params["signature_b64"])
+        else:
+            sig = bytes.fromhex(params["signature"])
+        self._verify_key.verify(self._challenge, sig)
+        return {
+            "id": req["id"],
+            "result": {"authenticated": True, "expires_at": time.time() + 3600},
+        }
+
+    def rpc_resume_session(self, req, params):
+        if params["session_id"] not in self.sessions:
+            return self.error(req, "SESSION_EXPIRED", "unknown session")
+        return {"id": req["id"], "result": {"authenticated": True}}
+
+    def rpc_retrieve(self, req, params):
+        path = params["path"]
+        if path not in SECRETS:
+            return self.error(req, "CREDENTIAL_NOT_FOUND", path)
+        self.leases.append(f"lease-{next(self._lease_ids)}")
+        result = {
+            "lease_id": self.leases[-1],
+            "expires_at": time.time() + params.get("ttl", 3600),
+        }
+        if self.b64:
+            result["value_b64"] = base64.b64encode(SECRETS[path].encode()).decode()
+        else:
+            result["value"] = SECRETS[path].encode().hex()
+        return {"id": req["id"], "result": result}
+
+    def rpc_malformed(self, req, params):
+        # What a daemon sends when it cannot tell which request was meant.
+        return {"id": None, "error": {"code": "INTERNAL_ERROR", "message": "bad frame"}}
+
+    def rpc_release_lease(self, req, params):
+        return {"id": req["id"], "result": {}}
+
+    def rpc_release_lease_batch(self, req, params):
+        if "release_lease_batch" not in self.capabilities:
+            return self.error(req, "INTERNAL_ERROR", "unknown method")
+        return {"id": req["id"], "result": {}}
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+class FakeServer:
+    """Accepts connections on a Unix socket, one FakeDaemon per connection."""
+
+    def __init__(self, path: str, **daemon_kwargs):
+        self.path = path
+        self.daemon_kwargs = daemon_kwargs
+        self.daemons = []
+        self.sessions = set()
+        self._lease_ids = itertools.count(1)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            self.daemons.append(
+                FakeDaemon(
+                    sock,
+                    sessions=self.sessions,
+                    lease_ids=self._lease_ids,
+                    **self.daemon_kwargs,
+                )
+            )
+
+    def close(self):
+        self._listener.close()
+        for daemon in self.daemons:
+            daemon.close()
@@ -0,0 +1,91 @@
+"""Tests for AsyncSanctumClient."""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+from sanctum_ai import AsyncSanctumClient, CredentialNotFound, VaultError
+from tests.fake_daemon import FakeServer, write_key
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = FakeServer(str(tmp_path / "vault.sock"))
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def client(server, tmp_path):
+    return AsyncSanctumClient(
+        "test-agent", socket_path=server.path, key_path=write_key(tmp_path)
+    )
+
+
+class TestAsyncClient:
+    def test_concurrent_retrieve(self, client, server):
+        async def main():
+            async with client:
+                values = await client.retrieve_many(["openai/api-key", "github/token"])
+                assert len(client._leases) == 2
+            return values
+
+        values = asyncio.run(main())
+        assert values == {"openai/api-key": "sk-test", "github/token": "ghp_test"}
+        methods = [r["method"] for r in server.daemons[0].requests]
+        assert methods.count("release_lease") == 2
+
+    def test_error_is_raised_to_caller(self, client):
+        async def main():
+            async with client:
+                with pytest.raises(CredentialNotFound):
+                    await client.retrieve("missing/key")
+                assert await client.retrieve("github/token") == "ghp_test"
+
+        asyncio.run(main())
+
+    def test_pending_calls_fail_when_connection_drops(self, client, server):
+        async def main():
+            async with client:
+                server.daemons[0].close()
+                await asyncio.wait_for(client._read_task, 5)
+                with pytest.raises(VaultError, match="Connection closed"):
+                    await client.retrieve("github/token")
+
+        asyncio.run(main())
+
+    def test_unmatched_response_fails_pending_calls(self, client):
+        async def main():
+            async with client:
+                with pytest.raises(VaultError, match="bad frame"):
+                    await asyncio.wait_for(client._call("malformed", {}), 5)
+                with pytest.raises(VaultError, match="bad frame"):
+                    await client.retrieve("github/token")
+
+        asyncio.run(main())
+
+
+    def test_close_disconnects_when_release_fails(self, client):
+        async def failing_release(lease_ids):
+            raise ConnectionResetError("reset by peer")
+
+        async def main():
+            await client.connect()
+            await client.retrieve("github/token")
+            client.release_leases = failing_release
+            with pytest.raises(ConnectionResetError):
+                await client.close()
+            assert client._read_task is None
+            assert client._writer is None
+
+        asyncio.run(main())
+
+
+def test_sync_import_skips_asyncio():
+    code = "import sys, sanctum_ai; print('asyncio' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"
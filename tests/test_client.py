@@ -0,0 +1,351 @@
+"""Tests for SanctumClient against an in-process fake daemon."""
+
+import os
+
+import pytest
+from nacl.signing import SigningKey
+
+from sanctum_ai.client import (
+    KDF_ARGON2ID,
+    KDF_PBKDF2_SHA256,
+    KDF_SCRYPT,
+    SanctumClient,
+)
+from sanctum_ai.exceptions import AuthError, CredentialNotFound
+from tests.fake_daemon import SEED, FakeDaemon, FakeServer, write_key
+
+
+@pytest.fixture
+def make_client():
+    daemons = []
+
+    def factory(batch: int = 1, **kwargs):
+        sock, daemon = FakeDaemon.pair(batch, **kwargs)
+        daemons.append(daemon)
+        client = SanctumClient("test-agent")
+        client._sock = sock
+        client._session_id = "session-1"
+        return client, daemon
+
+    yield factory
+    for daemon in daemons:
+        daemon.close()
+
+
+class TestRetrieve:
+    def test_retrieve_tracks_lease(self, make_client):
+        client, _ = make_client()
+        assert client.retrieve("openai/api-key") == "sk-test"
+        assert list(client._leases) == ["lease-1"]
+
+    def test_retrieve_base64_value(self, make_client):
+        client, _ = make_client(b64=True)
+        assert client.retrieve("github/token") == "ghp_test"
+
+    def test_retrieve_many_pipelines(self, make_client):
+        client, daemon = make_client(batch=2)
+        values = client.retrieve_many(["openai/api-key", "github/token"], ttl=60)
+        assert values == {"openai/api-key": "sk-test", "github/token": "ghp_test"}
+        assert len(client._leases) == 2
+        assert all(r["params"]["ttl"] == 60 for r in daemon.requests)
+
+    def test_retrieve_many_large_batch_does_not_deadlock(self, make_client):
+        client, daemon = make_client()
+        client._sock.settimeout(10)  # fail rather than hang on a regression
+        paths = [f"missing/{i}" for i in range(5_000)]
+        with pytest.raises(CredentialNotFound):
+            client.retrieve_many(paths)
+        assert len(daemon.requests) == 5_000
+
+    def test_retrieve_many_deduplicates(self, make_client):
+        client, daemon = make_client()
+        values = client.retrieve_many(["github/token", "github/token"])
+        assert values == {"github/token": "ghp_test"}
+        assert len(daemon.requests) == 1
+
+    def test_retrieve_many_keeps_leases_on_error(self, make_client):
+        client, _ = make_client(batch=2)
+        with pytest.raises(CredentialNotFound):
+            client.retrieve_many(["missing/key", "github/token"])
+        assert len(client._leases) == 1
+
+
+class TestCache:
+    @staticmethod
+    def retrieves(daemon):
+        return [r for r in daemon.requests if r["method"] == "retrieve"]
+
+    def test_cache_serves_repeat_retrievals(self, make_client):
+        client, daemon = make_client()
+        client._cache_ttl = 300
+        assert client.retrieve("openai/api-key") == "sk-test"
+        assert client.retrieve("openai/api-key") == "sk-test"
+        values = client.retrieve_many(["openai/api-key"])
+        assert values == {"openai/api-key": "sk-test"}
+        assert len(self.retrieves(daemon)) == 1
+
+    def test_invalidate_forces_refetch(self, make_client):
+        client, daemon = make_client()
+        client._cache_ttl = 300
+        client.retrieve("openai/api-key")
+        client.invalidate("openai/api-key")
+        client.retrieve("openai/api-key")
+        assert len(self.retrieves(daemon)) == 2
+
+    def test_refreshes_after_two_thirds_of_lifetime(self, make_client, monkeypatch):
+        import sanctum_ai.client as client_mod
+
+        now = [1000.0]
+        monkeypatch.setattr(client_mod.time, "monotonic", lambda: now[0])
+        client, daemon = make_client()
+        client._cache_ttl = 300
+        client.retrieve("openai/api-key", ttl=30)
+        now[0] += 19
+        client.retrieve("openai/api-key")
+        assert len(self.retrieves(daemon)) == 1
+        now[0] += 2
+        client.retrieve("openai/api-key")
+        assert len(self.retrieves(daemon)) == 2
+
+    def test_concurrent_retrievals_coalesce(self, make_client):
+        import threading
+
+        client, daemon = make_client()
+        client._cache_ttl = 300
+        threads = [
+            threading.Thread(target=client.retrieve, args=("github/token",))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(self.retrieves(daemon)) == 1
+        assert not client._fetch_locks
+
+    def test_release_drops_cached_value(self, make_client):
+        client, daemon = make_client()
+        client._cache_ttl = 300
+        client.retrieve("openai/api-key")
+        client.release_leases(list(client._leases))
+        assert not client._leases
+        client.retrieve("openai/api-key")
+        assert len(self.retrieves(daemon)) == 2
+
+    def test_lifetime_bounded_by_expires_at(self, make_client):
+        import time
+
+        client, _ = make_client()
+        client._cache_ttl = 300
+        result = {"lease_id": "lease-9", "expires_at": time.time() + 3}
+        client._cache_put("openai/api-key", "sk-test", result, None)
+        refresh_at = client._cache["openai/api-key"][2]
+        assert refresh_at - time.monotonic() <= 2
+        expired = {"lease_id": "lease-8", "expires_at": time.time() - 1}
+        client._cache_put("github/token", "ghp_test", expired, None)
+        assert "github/token" not in client._cache
+
+
+class TestRelease:
+    def test_close_pipelines_releases(self, make_client):
+        client, daemon = make_client(batch=2)
+        client.retrieve_many(["openai/api-key", "github/token"])
+        client.close()
+        releases = [r for r in daemon.requests if r["method"] == "release_lease"]
+        assert len(releases) == 2
+        assert not client._leases
+
+    def test_batch_release_when_advertised(self, make_client):
+        client, daemon = make_client(capabilities=["release_lease_batch"])
+        client._capabilities = frozenset(daemon.capabilities)
+        client.retrieve("openai/api-key")
+        client.retrieve("github/token")
+        client.release_leases(list(client._leases))
+        assert daemon.requests[-1]["method"] == "release_lease_batch"
+        assert daemon.requests[-1]["params"]["lease_ids"] == ["lease-1", "lease-2"]
+        assert not client._leases
+
+    def test_close_releases_thousands_of_leases(self, make_client):
+        client, daemon = make_client()
+        client._sock.settimeout(10)  # fail rather than hang on a regression
+        client._leases = dict.fromkeys(f"lease-{i}" for i in range(10_000))
+        client.close()
+        assert not client._leases
+        assert len(daemon.requests) == 10_000
+
+
+class TestConnect:
+    def test_base64_challenge(self, tmp_path):
+        sock, daemon = FakeDaemon.pair(b64=True)
+        try:
+            client = SanctumClient("test-agent", key_path=write_key(tmp_path))
+            client._sock = sock
+            client._authenticate()
+            assert client._session_id
+            assert "signature_b64" in daemon.requests[-1]["params"]
+        finally:
+            daemon.close()
+
+    def test_authenticates_over_unix_socket(self, tmp_path):
+        server = FakeServer(str(tmp_path / "vault.sock"))
+        try:
+            client = SanctumClient(
+                "test-agent", socket_path=server.path, key_path=write_key(tmp_path)
+            )
+            with client:
+                assert client._session_id
+                assert client.retrieve("openai/api-key") == "sk-test"
+            assert client._sock is None
+        finally:
+            server.close()
+
+    def test_resumes_cached_session(self, tmp_path):
+        server = FakeServer(str(tmp_path / "vault.sock"))
+        cache = str(tmp_path / "session.json")
+        try:
+            kwargs = dict(
+                socket_path=server.path,
+                key_path=write_key(tmp_path),
+                session_cache=cache,
+            )
+            with SanctumClient("test-agent", **kwargs) as client:
+                first = client._session_id
+            assert os.stat(cache).st_mode & 0o777 == 0o600
+            with SanctumClient("test-agent", **kwargs) as client:
+                assert client._session_id == first
+            methods = [r["method"] for r in server.daemons[1].requests]
+            assert methods == ["resume_session"]
+
+            server.sessions.clear()
+            with SanctumClient("test-agent", **kwargs) as client:
+                assert client._session_id != first
+        finally:
+            server.close()
+
+    def test_peer_auth_skips_challenge(self, tmp_path):
+        server = FakeServer(str(tmp_path / "vault.sock"), peer_auth=True)
+        try:
+            client = SanctumClient(
+                "test-agent",
+                socket_path=server.path,
+                key_path=str(tmp_path / "no-such.key"),
+                peer_auth=True,
+            )
+            with client:
+                assert client._session_id.startswith("peer-")
+            methods = [r["method"] for r in server.daemons[0].requests]
+            assert methods[0] == "authenticate_peer"
+            assert "authenticate" not in methods
+        finally:
+            server.close()
+
+    def test_peer_auth_is_opt_in(self, tmp_path):
+        server = FakeServer(str(tmp_path / "vault.sock"), peer_auth=True)
+        try:
+            client = SanctumClient(
+                "test-agent", socket_path=server.path, key_path=write_key(tmp_path)
+            )
+            with client:
+                pass
+            methods = [r["method"] for r in server.daemons[0].requests]
+            assert "authenticate_peer" not in methods
+        finally:
+            server.close()
+
+    def test_peer_auth_not_retried_after_fallback(self, tmp_path):
+        client = SanctumClient(
+            "test-agent", key_path=write_key(tmp_path), peer_auth=True
+        )
+        methods = []
+        for _ in range(2):
+            sock, daemon = FakeDaemon.pair()
+            client._sock = sock
+            client._authenticate()
+            methods += [r["method"] for r in daemon.requests]
+            daemon.close()
+        assert methods.count("authenticate_peer") == 1
+        assert methods.count("challenge_response") == 2
+
+
+class TestKeys:
+    def test_signing_key_loaded_once(self, tmp_path, monkeypatch):
+        client = SanctumClient("test-agent", key_path=write_key(tmp_path))
+        calls = []
+        resolve = client._resolve_key
+
+        def counting_resolve():
+            calls.append(1)
+            return resolve()
+
+        monkeypatch.setattr(client, "_resolve_key", counting_resolve)
+        for _ in range(2):
+            sock, daemon = FakeDaemon.pair()
+            client._sock = sock
+            client._authenticate()
+            daemon.close()
+        assert len(calls) == 1
+
+    def test_encrypted_key_derivation_cached(self, tmp_path, monkeypatch):
+        from nacl.secret import SecretBox
+        import sanctum_ai.client as client_mod
+
+        salt, nonce = os.urandom(16), os.urandom(24)
+        box = SecretBox(client_mod._derive_kek(b"hunter2", salt))
+        path = tmp_path / "agent.key.enc"
+        path.write_text((salt + nonce + box.encrypt(SEED, nonce).ciphertext).hex())
+
+        client_mod._kek_cache.clear()
+        calls = []
+        run_kdf = client_mod._run_kdf
+        monkeypatch.setattr(
+            client_mod, "_run_kdf", lambda *a: calls.append(1) or run_kdf(*a)
+        )
+        for _ in range(2):
+            sk = SanctumClient._load_encrypted_key(str(path), "hunter2")
+            assert sk.sign(b"msg") == SigningKey(SEED).sign(b"msg").signature
+        assert len(calls) == 1
+        assert all(b"hunter2" not in key for key in client_mod._kek_cache)
+
+    @pytest.mark.parametrize(
+        "kdf, params",
+        [
+            (KDF_PBKDF2_SHA256, (1_000,)),
+            (KDF_SCRYPT, (2**10, 8, 1)),
+            (KDF_ARGON2ID, (1, 1024, 1)),
+        ],
+    )
+    def test_encrypted_key_with_kdf_header(self, tmp_path, kdf, params):
+        from nacl.secret import SecretBox
+        from sanctum_ai.client import _KDF_PARAMS, _derive_kek
+
+        if kdf == KDF_ARGON2ID:
+            pytest.importorskip("argon2")
+        salt, nonce = os.urandom(16), os.urandom(24)
+        box = SecretBox(_derive_kek(b"hunter2", salt, kdf, params))
+        header = bytes([kdf]) + _KDF_PARAMS[kdf].pack(*params)
+        blob = header + salt + nonce + box.encrypt(SEED, nonce).ciphertext
+        path = tmp_path / "agent.key.enc"
+        path.write_text(blob.hex())
+        sk = SanctumClient._load_encrypted_key(str(path), "hunter2")
+        assert sk.sign(b"msg") == SigningKey(SEED).sign(b"msg").signature
+
+    def test_unknown_kdf_rejected(self, tmp_path):
+        path = tmp_path / "agent.key.enc"
+        path.write_text((b"\x7f" + bytes(88)).hex())
+        with pytest.raises(AuthError, match="KDF 0x7f"):
+            SanctumClient._load_encrypted_key(str(path), "hunter2")
+
+    @pytest.mark.parametrize(
+        "blob",
+        [
+            b"",
+            bytes([KDF_SCRYPT, 0, 0]),  # truncated cost parameters
+            bytes([KDF_PBKDF2_SHA256]) + bytes(92),  # zero iterations
+            bytes([KDF_PBKDF2_SHA256, 0, 0, 4, 0]) + bytes(60),  # bad ciphertext
+        ],
+    )
+    def test_malformed_key_file_raises_auth_error(self, tmp_path, blob):
+        path = tmp_path / "agent.key.enc"
+        path.write_text(blob.hex())
+        with pytest.raises(AuthError):
+            SanctumClient._load_encrypted_key(str(path), "hunter2")
@@ -0,0 +1,71 @@
+"""Tests for transport selection."""
+
+import socket
+
+import pytest
+
+from sanctum_ai.connection import TCPConnection, UnixConnection, resolve_connection
+
+
+class TestResolveConnection:
+    def test_defaults_to_unix_socket(self, tmp_path):
+        conn = resolve_connection(None, None, None, str(tmp_path / "vault.sock"))
+        assert isinstance(conn, UnixConnection)
+
+    def test_remote_host_uses_tcp(self, tmp_path):
+        sock_path = tmp_path / "vault.sock"
+        sock_path.touch()
+        conn = resolve_connection(None, "10.0.0.5", 7600, str(sock_path))
+        assert isinstance(conn, TCPConnection)
+        assert conn.address == ("10.0.0.5", 7600)
+
+    def test_loopback_prefers_existing_unix_socket(self, tmp_path):
+        sock_path = tmp_path / "vault.sock"
+        conn = resolve_connection(None, "127.0.0.1", 7600, str(sock_path))
+        assert isinstance(conn, TCPConnection)
+        sock_path.touch()
+        conn = resolve_connection(None, "127.0.0.1", 7600, str(sock_path))
+        assert isinstance(conn, UnixConnection)
+        assert conn.address == str(sock_path)
+
+    def test_unix_preference_can_be_disabled(self, tmp_path):
+        sock_path = tmp_path / "vault.sock"
+        sock_path.touch()
+        conn = resolve_connection(
+            None, "localhost", 7600, str(sock_path), prefer_unix_socket=False
+        )
+        assert isinstance(conn, TCPConnection)
+
+
+class TestTCPConnection:
+    def test_sets_nodelay(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        try:
+            sock = TCPConnection(*listener.getsockname()).open()
+            try:
+                assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            finally:
+                sock.close()
+        finally:
+            listener.close()
+
+    @pytest.mark.skipif(not socket.has_ipv6, reason="no IPv6 support")
+    def test_connects_to_ipv6_loopback(self):
+        listener = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+        try:
+            listener.bind(("::1", 0))
+        except OSError:
+            listener.close()
+            pytest.skip("IPv6 loopback unavailable")
+        listener.listen()
+        try:
+            sock = TCPConnection("::1", listener.getsockname()[1]).open()
+            try:
+                assert sock.family == socket.AF_INET6
+                assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+            finally:
+                sock.close()
+        finally:
+            listener.close()
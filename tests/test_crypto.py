@@ -0,0 +1,20 @@
+"""Tests for the Ed25519 signing backend."""
+
+import pytest
+from nacl.signing import SigningKey
+
+from sanctum_ai import _crypto
+from sanctum_ai._crypto import Ed25519Signer
+
+SEED = bytes(range(32))
+
+
+@pytest.mark.parametrize("backend", ["default", "nacl"])
+def test_signature_matches_pynacl(backend, monkeypatch):
+    if backend == "nacl":
+        monkeypatch.setattr(_crypto, "Ed25519PrivateKey", None)
+    signer = Ed25519Signer(SEED)
+    reference = SigningKey(SEED)
+    sig = signer.sign(b"challenge")
+    assert sig == reference.sign(b"challenge").signature
+    reference.verify_key.verify(b"challenge", sig)
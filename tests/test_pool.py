@@ -0,0 +1,123 @@
+"""Tests for SanctumConnectionPool."""
+
+import pytest
+
+from sanctum_ai import (
+    CredentialNotFound,
+    SanctumClient,
+    SanctumConnectionPool,
+    VaultError,
+)
+from tests.fake_daemon import FakeServer, write_key
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = FakeServer(str(tmp_path / "vault.sock"))
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def pool(server, tmp_path):
+    p = SanctumConnectionPool(
+        "test-agent",
+        socket_path=server.path,
+        key_path=write_key(tmp_path),
+        maxsize=2,
+        block=False,
+    )
+    yield p
+    p.close()
+
+
+class TestPool:
+    def test_reuses_authenticated_connection(self, pool, server):
+        with SanctumClient.from_pool(pool) as client:
+            assert client.retrieve("openai/api-key") == "sk-test"
+            first = client._session_id
+        with SanctumClient.from_pool(pool) as client:
+            assert client.retrieve("github/token") == "ghp_test"
+            assert client._session_id == first
+        assert len(server.daemons) == 1
+        methods = [r["method"] for r in server.daemons[0].requests]
+        assert methods.count("authenticate") == 1
+
+    def test_exhausted_without_blocking(self, pool):
+        with pool.acquire(), pool.acquire():
+            with pytest.raises(VaultError, match="exhausted"):
+                pool.get()
+
+    def test_acquire_discards_on_transport_error(self, pool, server):
+        with pytest.raises(OSError):
+            with pool.acquire():
+                raise OSError("boom")
+        with pool.acquire() as (_, session_id):
+            assert session_id
+        assert len(server.daemons) == 2
+
+    def test_replaces_dropped_connection(self, pool, server):
+        with pool.acquire():
+            pass
+        server.daemons[0].close()
+        with pool.acquire() as (_, session_id):
+            assert session_id
+        assert len(server.daemons) == 2
+
+    def test_close_returns_slot_when_daemon_drops(self, server, tmp_path):
+        pool = SanctumConnectionPool(
+            "test-agent",
+            socket_path=server.path,
+            key_path=write_key(tmp_path),
+            maxsize=1,
+            block=False,
+        )
+        client = SanctumClient.from_pool(pool).connect()
+        client.retrieve("github/token")
+        server.daemons[0].close()
+        try:
+            client.close()
+        except OSError:
+            pass  # e.g. BrokenPipeError while releasing the lease
+        with pool.acquire() as (_, session_id):
+            assert session_id
+        assert len(server.daemons) == 2
+        pool.close()
+
+    def test_batch_never_blocks(self, pool):
+        with pool.acquire():
+            with pool.batch(5) as conns:
+                assert len(conns) == 1
+            with pool.batch(1) as conns:
+                assert len(conns) == 1
+
+
+class TestRetrieveParallel:
+    def test_fans_out_over_pool(self, pool, server):
+        with SanctumClient.from_pool(pool) as client:
+            values = client.retrieve_parallel(["openai/api-key", "github/token"])
+            assert values == {"openai/api-key": "sk-test", "github/token": "ghp_test"}
+            assert list(client._leases) == server.daemons[0].leases
+        assert len(server.daemons) == 2
+        # Every lease is released on the connection (session) that took it.
+        for daemon in server.daemons:
+            released = [
+                r["params"]["lease_id"]
+                for r in daemon.requests
+                if r["method"] == "release_lease"
+            ]
+            assert released == daemon.leases
+
+    def test_raises_after_attempting_all(self, pool, server):
+        with SanctumClient.from_pool(pool) as client:
+            with pytest.raises(CredentialNotFound):
+                client.retrieve_parallel(["missing/key", "github/token"])
+        assert sum(len(d.leases) for d in server.daemons) == 1
+
+    def test_unpooled_client_pipelines(self, server, tmp_path):
+        client = SanctumClient(
+            "test-agent", socket_path=server.path, key_path=write_key(tmp_path)
+        )
+        with client:
+            values = client.retrieve_parallel(["github/token"])
+        assert values == {"github/token": "ghp_test"}
@@ -57,6 +57,10 @@ class TestRaiseOnError:
         from sanctum_ai.protocol import raise_on_error
         raise_on_error({"id": 1, "result": {}})  # Should not raise
 
+    def test_null_error(self):
+        from sanctum_ai.protocol import raise_on_error
+        raise_on_error({"id": 1, "result": {}, "error": None})
+
     def test_string_error(self):
         from sanctum_ai.protocol import raise_on_error
         with pytest.raises(VaultError, match="something went wrong"):
@@ -77,3 +81,112 @@ class TestRaiseOnError:
             })
         assert exc_info.value.code == "ACCESS_DENIED"
         assert exc_info.value.detail == "policy forbids"
+
+
+class TestSocketIO:
+    def test_send_recv_roundtrip(self):
+        import socket
+        from sanctum_ai.protocol import send, recv
+        a, b = socket.socketpair()
+        try:
+            obj = {"id": 7, "result": {"value": "ab" * 2_000}}
+            send(a, obj)
+            assert recv(b) == obj
+        finally:
+            a.close()
+            b.close()
+
+    def test_recv_connection_closed(self):
+        import socket
+        from sanctum_ai.protocol import recv
+        a, b = socket.socketpair()
+        a.sendall(struct.pack(">I", 10) + b"{}")
+        a.close()
+        with pytest.raises(VaultError, match="Connection closed"):
+            recv(b)
+        b.close()
+
+    def test_recv_enforces_max_size(self):
+        import socket
+        from sanctum_ai.protocol import send, recv
+        a, b = socket.socketpair()
+        try:
+            send(a, {"id": 1, "result": {"value": "x" * 100}})
+            with pytest.raises(VaultError, match="Response too large") as exc_info:
+                recv(b, max_size=64)
+            assert "64-byte limit" in exc_info.value.detail
+        finally:
+            a.close()
+            b.close()
+
+
+class TestSendPayloads:
+    class ShortWriteSocket:
+        """Accepts at most a few bytes per sendmsg call."""
+
+        def __init__(self, limit):
+            self.limit = limit
+            self.data = b""
+
+        def sendmsg(self, buffers):
+            chunk = b"".join(bytes(b) for b in buffers)[: self.limit]
+            self.data += chunk
+            return len(chunk)
+
+    def test_handles_partial_writes(self):
+        from sanctum_ai.protocol import _dumps, send_payloads
+        objs = [{"id": i, "method": "release_lease"} for i in range(50)]
+        sock = self.ShortWriteSocket(limit=7)
+        send_payloads(sock, [_dumps(obj) for obj in objs])
+        rest = sock.data
+        for obj in objs:
+            decoded, rest = decode_frame(rest)
+            assert decoded == obj
+        assert rest == b""
+
+    def test_falls_back_without_sendmsg(self):
+        from sanctum_ai.protocol import send_payloads
+
+        class PlainSocket:
+            data = b""
+
+            def sendall(self, data):
+                self.data += data
+
+        sock = PlainSocket()
+        send_payloads(sock, [b'{"id":1}', b'{"id":2}'])
+        assert sock.data == encode_frame({"id": 1}) + encode_frame({"id": 2})
+
+
+class TestEncodeRequest:
+    @pytest.mark.parametrize(
+        "params, fits_template",
+        [
+            ({"session_id": "s-1", "path": "openai/api-key"}, True),
+            ({"session_id": "s-1", "path": 'we"ird\\path/ü', "ttl": 300}, True),
+            ({"session_id": None, "path": "a/b", "ttl": None}, True),
+            ({"path": "a/b", "session_id": "s-1"}, False),
+            ({"session_id": "s-1", "path": "a/b", "extra": True}, False),
+        ],
+    )
+    def test_retrieve_template_matches_generic(self, params, fits_template):
+        from sanctum_ai.protocol import _encode_retrieve, encode_request
+        generic = json.dumps(
+            {"id": 42, "method": "retrieve", "params": params},
+            separators=(",", ":"),
+        ).encode()
+        templated = _encode_retrieve(42, params)
+        if fits_template:
+            assert templated == generic
+        else:
+            assert templated is None
+        assert json.loads(encode_request(42, "retrieve", params)) == json.loads(generic)
+
+    def test_other_methods_use_generic_encoding(self):
+        from sanctum_ai.protocol import encode_request
+        payload = encode_request(3, "list", {"session_id": "s"})
+        assert json.loads(payload) == {
+            "id": 3,
+            "method": "list",
+            "params": {"session_id": "s"},
+        }